@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime, timedelta
 
 # Create or load the dataset
@@ -10,11 +10,19 @@ def load_data():
         df = pd.read_csv('meat_eating_log.csv')
     except FileNotFoundError:
         # Create an empty DataFrame if the file doesn't exist
-        df = pd.DataFrame(columns=['date'])
+        df = pd.DataFrame(columns=['date', 'count'])
     
     # Ensure the 'date' column is of datetime type and strip any time information
+    # (older logs saved timestamps); an unparseable date raises instead of being dropped on the next save
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.normalize()  # Stripping time part
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601').dt.normalize()
+
+    if 'count' in df.columns:
+        # Merge days that only differed by their time part
+        df = df.groupby('date', as_index=False)['count'].sum()
+    else:
+        # Older logs stored one row per event; collapse them into one row per date
+        df = df.groupby('date', as_index=False).size().rename(columns={'size': 'count'})
     return df
 
 # Save the data to a CSV
@@ -22,12 +30,16 @@ def save_data(df):
     df.to_csv('meat_eating_log.csv', index=False)
 
 # Function to update meat-eating log
-def add_meat_day(date, df):
-    # Add new meat day entry (allowing for multiple entries per day)
-    # Make sure the date has no time part
-    date = pd.to_datetime(date).normalize()  # Normalize to ensure no time component
-    new_row = pd.DataFrame({'date': [date]})
-    df = pd.concat([df, new_row], ignore_index=True)
+def add_meat_day(date, df, events=1):
+    # Add the events to the day's count (one row per date, multiple events per day)
+    # date_input returns a datetime.date, so the timestamp has no time part
+    date = pd.Timestamp(date)
+    existing = df['date'] == date
+    if existing.any():
+        df.loc[existing, 'count'] += events
+    else:
+        new_row = pd.DataFrame({'date': [date], 'count': [events]})
+        df = pd.concat([df, new_row], ignore_index=True)
     return df
 
 # Streamlit UI
@@ -43,43 +55,35 @@ meat_events_input = st.sidebar.number_input("How many times did you eat meat on
 
 if st.sidebar.button("Log"):
     # Add the meat-eating events for that day
-    for _ in range(meat_events_input):
-        df = add_meat_day(meat_day_input, df)
+    df = add_meat_day(meat_day_input, df, meat_events_input)
     save_data(df)
     st.sidebar.success(f"{meat_events_input} meat-eating events added for {meat_day_input}!")
 
 # Display the data
 st.subheader("Timeseries")
 if not df.empty:
-    # Ensure the 'date' column is datetime and set it as the index
-    df['date'] = pd.to_datetime(df['date'])
-    df.set_index('date', inplace=True)
-    
-    # Resample by day and count the meat-eating events
-    df_resampled = df.resample('D').size()
+    # Ensure the 'date' column is datetime (a new log starts out as an empty object column)
+    if not pd.api.types.is_datetime64_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'])
 
     # Ensure we have data starting from March 2025 (or earliest date)
     start_date = pd.to_datetime('2025-03-01')  # Start date can be changed as required
     all_dates = pd.date_range(start=start_date, end=datetime.today(), freq='D')
-    df_resampled = df_resampled.reindex(all_dates, fill_value=0)  # Fill missing dates with 0
-
-    plt.figure(figsize=(10, 6))
-    plt.plot(df_resampled.index, df_resampled.values, marker='o', color='blue', label='Meat-eating events')
-
-    # Make sure the Y-axis has whole numbers
-    plt.yticks(range(0, int(df_resampled.max()) + 1))
 
-    # Ensure dates on the x-axis are formatted properly (without time)
-    plt.xlabel("Date")
-    plt.ylabel("Number of Meat-Eating Events")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    # Sum the meat-eating events per day by their day offset from the start date
+    offsets = (df['date'] - start_date).dt.days.to_numpy()
+    in_range = (offsets >= 0) & (offsets < len(all_dates))  # Also drops unparseable (NaT) dates
+    counts = np.bincount(offsets[in_range].astype(np.int64),
+                         weights=df['count'].to_numpy(dtype=float)[in_range],
+                         minlength=len(all_dates))
+    df_resampled = pd.Series(counts.astype(np.int64), index=all_dates)  # Missing dates are 0
 
-    st.pyplot(plt)
+    # Drawn client-side, so reruns only send the daily counts
+    st.line_chart(df_resampled.rename('Meat-eating events'), x_label="Date", y_label="Number of Meat-Eating Events")
 
 # Add a reset button in the sidebar to clear data
 if st.sidebar.button("Reset Data"):
     # Clear the meat_eating_log.csv file by overwriting it with an empty DataFrame
-    df = pd.DataFrame(columns=['date'])
+    df = pd.DataFrame(columns=['date', 'count'])
     save_data(df)
     st.sidebar.success("Data has been reset!")
@@ -1,13 +1,23 @@
+import hashlib
+import io
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime
-from pydrive.auth import GoogleAuth
-from pydrive.drive import GoogleDrive
-from oauth2client.service_account import ServiceAccountCredentials
 
 # --- GOOGLE DRIVE SETUP (Service Account Auth) ---
+# Rebuilt before the one-hour access token expires: PyDrive cannot refresh a service account
+# token and falls back to a browser login. With LOOKUP_TTL, cached file handles stay valid too.
+@st.cache_resource(ttl=45 * 60)
 def init_drive():
+    # Imported here, so sessions without a username yet do not load the Drive libraries
+    from pydrive.auth import GoogleAuth
+    from pydrive.drive import GoogleDrive
+    from oauth2client.service_account import ServiceAccountCredentials
+
     scope = ['https://www.googleapis.com/auth/drive']
     creds_dict = st.secrets["google"]["service_account"]
     credentials = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
@@ -16,246 +26,346 @@ def init_drive():
     gauth.credentials = credentials
     return GoogleDrive(gauth)
 
-drive = init_drive()
-
 # --- USERNAME SETUP ---
-username = st.sidebar.text_input("Enter your username to access your data")
+# Inside a form, so the app only reruns once the username is submitted
+with st.sidebar.form("login"):
+    username = st.text_input("Enter your username to access your data", key="username")
+    st.form_submit_button("Enter")
 
 # --- LOAD AND SAVE FUNCTIONS ---
-def load_data(username):
-    filename = f"{username}.csv"
-    file_list = drive.ListFile({'q': f"title='{filename}' and trashed=false"}).GetList()
-    if file_list:
-        file = file_list[0]
-        file.GetContentFile(filename)
-        df = pd.read_csv(filename, parse_dates=['date'])
-        df['date'] = pd.to_datetime(df['date']).dt.normalize()
-        if 'count' not in df.columns:
-            df['count'] = 1
-        return df, file
+LOOKUP_TTL = 300  # Seconds before a user's file is looked up on Drive again
+
+# username -> (Drive file or None, lookup time), shared by all sessions; uploads store their file here
+@st.cache_resource
+def get_file_index():
+    return {}
+
+def find_user_file(username):
+    file_index = get_file_index()
+    entry = file_index.get(username)
+    if entry is None or time.monotonic() - entry[1] > LOOKUP_TTL:
+        filename = f"{username}.csv"
+        file_list = drive.ListFile({
+            'q': f"title='{filename}' and trashed=false",
+            'maxResults': 1,
+            'fields': 'items(id,title,modifiedDate,downloadUrl)',  # downloadUrl is needed to fetch the content
+        }).GetList()
+        entry = (file_list[0] if file_list else None, time.monotonic())
+        file_index[username] = entry
+    return entry[0]
+
+# The frame and CSV text as save_data writes them, so loading and saving hash the same content
+def to_saved_csv(df):
+    # Row-wise .loc inserts upcast the column to float; store whole counts in date order
+    df = df.sort_index().astype({'count': 'int32'})
+    return df, df.to_csv()
+
+# Keyed on the file's id and modifiedDate, so the CSV is only downloaded and parsed again after it changed
+@st.cache_data(max_entries=32, show_spinner=False)
+def read_user_file(_file, file_id, modified_date):
+    # Read the download from memory instead of through a local copy
+    csv_text = _file.GetContentString()
+    df = pd.read_csv(io.StringIO(csv_text), usecols=lambda col: col in ('date', 'count'), dtype={'count': 'int32'})
+    # Older logs stored a time part; key every row on midnight like the forms do
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601').dt.normalize()
+    if 'count' in df.columns:
+        # Merge days that only differed by their time part
+        df = df.groupby('date')[['count']].sum()
     else:
-        return pd.DataFrame(columns=['date', 'count']), None
-
-def save_data(df, username, existing_file):
-    filename = f"{username}.csv"
-    df.to_csv(filename, index=False)
-    if existing_file:
-        existing_file.SetContentFile(filename)
-        existing_file.Upload()
+        # Older logs stored one row per event; collapse them into one row per date
+        df = df.groupby('date').size().to_frame('count')
+    df, saved_csv = to_saved_csv(df)
+    df_hash = hashlib.blake2b(saved_csv.encode()).digest()
+    return df, df_hash
+
+def load_data(username):
+    file = find_user_file(username)
+    if file is None:
+        return pd.DataFrame({'count': pd.Series(dtype='int32')}, index=pd.DatetimeIndex([], name='date')), None, None
+    df, df_hash = read_user_file(file, file['id'], file['modifiedDate'])
+    return df, file['id'], df_hash
+
+@st.cache_resource
+def get_upload_executor():
+    return ThreadPoolExecutor(max_workers=2)
+
+def upload_file(username, csv_text, file_id, file_index):
+    if file_id:
+        file = drive.CreateFile({'id': file_id})
     else:
-        new_file = drive.CreateFile({'title': filename})
-        new_file.SetContentFile(filename)
-        new_file.Upload()
+        file = drive.CreateFile({'title': f"{username}.csv", 'mimeType': 'text/csv'})
+    # Upload straight from memory instead of through a local copy
+    file.SetContentString(csv_text)
+    file.Upload()
+    # The uploaded file carries the new modifiedDate and its content, so the next load needs no Drive call
+    file_index[username] = (file, time.monotonic())
+    return file['id']
+
+def get_data(username):
+    upload = st.session_state.get('upload')
+    if upload and upload['future'].done():
+        del st.session_state['upload']
+        try:
+            upload['future'].result()
+        except Exception as e:
+            st.sidebar.error(f"Your last change could not be saved to Google Drive and was lost. "
+                             f"Please enter it again. ({e})")
+    elif upload and upload['username'] == username:
+        # Upload still running: show the data that is being uploaded
+        return upload['df'], None, upload['df_hash']
+    return load_data(username)
+
+# Returns whether an upload was started
+def save_data(df, username, file_id, df_hash):
+    df, csv_text = to_saved_csv(df)
+    new_hash = hashlib.blake2b(csv_text.encode()).digest()
+    # Skip the Drive upload when the content is unchanged since loading
+    if new_hash == df_hash:
+        return False
+    # Wait for the previous upload so that uploads of the same file stay in order
+    previous = st.session_state.pop('upload', None)
+    if previous:
+        try:
+            previous_file_id = previous['future'].result()
+        except Exception:
+            # For the same user this save builds on the failed upload's frame, so its changes are retried here
+            previous_file_id = None
+        if previous['username'] == username and previous_file_id:
+            file_id = previous_file_id
+    # Upload in the background so the app does not wait for Drive
+    future = get_upload_executor().submit(upload_file, username, csv_text, file_id, get_file_index())
+    st.session_state['upload'] = {'username': username, 'future': future, 'df': df, 'df_hash': new_hash}
+    return True
+
+# --- ACHIEVEMENT MESSAGES ---
+STREAK_ACHIEVEMENTS = {
+    100: "100-day streak",
+    111: "111-day streak",
+    125: "125-day streak",
+    150: "150-day streak",
+    175: "175-day streak",
+    183: "183-day streak",
+    222: "222-day streak",
+    250: "250-day streak",
+}
+STREAK_DAYS = sorted(STREAK_ACHIEVEMENTS)
+
+ACHIEVEMENT_HTML = {
+    "100-day streak": """
+        <div style='background-color:#d0ebff;padding:20px;border-radius:10px;border-left:5px solid #339af0;'>
+            <strong>🌈 100 meat-free days! You're on another level. 🐄🐖🐓🐑🐟 Thank you from the animals.</strong>
+        </div>
+    """,
+    "111-day streak": """
+        <div style='background-color:#d3f9d8;padding:20px;border-radius:10px;border-left:5px solid #69db7c;'>
+            <strong>🌀 111 days! A magical repeating streak. The universe approves! ✨</strong>
+        </div>
+    """,
+    "125-day streak": """
+        <div style='background-color:#fff3bf;padding:20px;border-radius:10px;border-left:5px solid #ffd43b;'>
+            <strong>💫 125 days! Your journey is inspiring. Every animal is cheering you on!/strong>
+        </div>
+    """,
+    "150-day streak": """
+        <div style='background-color:#ffe0b2;padding:20px;border-radius:10px;border-left:5px solid #ffa94d;'>
+            <strong>🔥 150 days! That’s dedication. The planet and animals thank you. 🌍🐷</strong>
+        </div>
+    """,
+    "175-day streak": """
+        <div style='background-color:#ffc9c9;padding:20px;border-radius:10px;border-left:5px solid #ff6b6b;'>
+            <strong>🌻 175 days meat-free! Your compassion is amazing 🌿</strong>
+        </div>
+    """,
+    "183-day streak": """
+        <div style='background-color:#e5dbff;padding:20px;border-radius:10px;border-left:5px solid #9775fa;'>
+            <strong>💚183 Täg - es haubs Jahr! Wi cool isch ds!! </strong><br>
+            <strong>💚I fröie mi so fescht bisch am dürezieh u i bi mega stouz uf di!💚</strong>
+        </div>
+    """,
+    "222-day streak": """
+        <div style='background-color:#f3d9fa;padding:20px;border-radius:10px;border-left:5px solid #da77f2;'>
+            <strong>🎯 222 Täg! Ds mues natürlech o spezieu füreghobe wärde😌 🐄🐖🐓</strong>
+        </div>
+    """,
+}
+
+WEEK_ACHIEVEMENT_HTML = """
+    <div style='background-color:#d4edda;padding:20px;border-radius:10px;border-left:5px solid green;'>
+        <strong>🌿 {week_count} full calendar weeks meat-free! Outstanding!</strong><br>
+        <strong>💚 Keep saving lives every week. 🐄🐖🐓🐟</strong>
+    </div>
+"""
+
+# --- DERIVED VIEW ---
+START_DATE = pd.Timestamp('2025-02-10')  # First day shown and counted
+
+# Keyed on the content hash from loading/saving instead of hashing the frame on every rerun
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_view(_df, df_hash, today):
+    all_dates = pd.date_range(start=START_DATE, end=today, freq='D')
+
+    # Scatter the logged counts onto the daily range by their day offset from the start date
+    offsets = (_df.index - START_DATE).days.to_numpy()
+    in_range = (offsets >= 0) & (offsets < len(all_dates))  # Also drops unparseable (NaT) dates
+    offsets = offsets[in_range].astype(np.int64)
+    values = np.bincount(offsets, weights=_df['count'].to_numpy(dtype=float)[in_range],
+                         minlength=len(all_dates)).astype(float)  # Float even with no weights, to hold NaN
+    is_unlogged = np.bincount(offsets, minlength=len(all_dates)) == 0
+    values[is_unlogged] = np.nan
+
+    # Per-day masks, computed once and shared by the streak, achievement and chart code
+    ate_meat = values > 0
+    is_zero = (values == 0).astype(np.int8)
+
+    # Run lengths of consecutive meat-free days (unlogged days break a streak)
+    run_starts = np.flatnonzero(np.diff(is_zero, prepend=0) == 1)
+    run_ends = np.flatnonzero(np.diff(is_zero, append=0) == -1) + 1
+    run_lengths = run_ends - run_starts
+    longest_streak = int(run_lengths.max(initial=0))
+    current_streak = int(run_lengths[-1]) if is_zero[-1] else 0
+
+    # --- Initialize Achievements ---
+    active_achievements = []
+    negative_message = None
+
+    # --- Meat-Free Calendar Weeks ---
+    # Full Monday-Sunday weeks inside each meat-free run
+    run_start_weekdays = (START_DATE.weekday() + run_starts) % 7
+    days_to_monday = (7 - run_start_weekdays) % 7
+    meat_free_weeks = int((np.maximum(run_lengths - days_to_monday, 0) // 7).sum())
+
+    # --- Handle Meat-Free Week Achievement (single dynamic) ---
+    if meat_free_weeks > 0:
+        week_achievement_name = f"{meat_free_weeks}-week meat-free streak"
+        active_achievements.append(week_achievement_name)
+
+    # --- Add only the highest unlocked streak achievement ---
+    unlocked = bisect_right(STREAK_DAYS, longest_streak)
+    if unlocked:
+        active_achievements.append(STREAK_ACHIEVEMENTS[STREAK_DAYS[unlocked - 1]])
+
+    # --- Handle Negative Achievement ---
+    if ate_meat[-1]:  # The series ends today
+        active_achievements.clear()
+        negative_message = """
+            <div style='background-color:#f8d7da;padding:20px;border-radius:10px;border-left:5px solid red;'>
+                <strong>🚨 Oh no! You ate meat after reaching such a nice streak! 👎</strong><br>
+                <strong>💚 Don't worry though, it's just a small setback.</strong><br>
+                <strong>🐄 Get right back to saving animals and unlock your achievements again!</strong>
+            </div>
+        """
+
+    # One column per bar colour; NaN hides the bar, so each day shows at most one
+    chart_data = pd.DataFrame({
+        "Unlogged Day": np.where(is_unlogged, 1, np.nan),
+        "Logged Meat Eating": np.where(ate_meat, values, np.nan),
+    }, index=all_dates)
+
+    return {
+        'current_streak': current_streak,
+        'longest_streak': longest_streak,
+        'active_achievements': active_achievements,
+        'negative_message': negative_message,
+        'chart_data': chart_data,
+        'unlogged_days': all_dates[is_unlogged],
+        'all_dates': all_dates,
+        'daily_counts': values,
+    }
+
+# CSV export; only built when the download button is clicked
+def build_download_csv(all_dates, daily_counts):
+    # Nullable integers, so logged days print as whole counts and unlogged (NaN) days stay blank
+    counts = pd.array(daily_counts).astype('Int64')
+    df_download = pd.DataFrame({'date': all_dates.strftime('%Y-%d-%m'), 'count': counts})
+    return df_download.to_csv(index=False).encode('utf-8')
+
+# --- DAY LOGGING ---
+# A fragment, so submitting the form only reruns this part until data is actually saved
+@st.fragment
+def log_day_fragment(df, username, file_id, df_hash):
+    with st.form("log_day"):
+        selected_date = st.date_input("Select the date")
+        meat_events = st.number_input("How many meat-eating events on this day?", min_value=0, step=1)
+        save_clicked = st.form_submit_button("Save")
+
+    if save_clicked:
+        selected_date = pd.to_datetime(selected_date).normalize()
+        df.loc[selected_date, 'count'] = meat_events
+        if save_data(df, username, file_id, df_hash):
+            st.success(f"Saved {meat_events} event(s) for {selected_date.date()}!")
+            st.rerun(scope="app")
+        else:
+            # Nothing changed, so the rest of the app does not need to rerun
+            st.info(f"{selected_date.date()} already has {meat_events} event(s) logged.")
 
 # --- MAIN APP ---
 st.title("Meat-Eating Tracker")
 st.sidebar.header("Tracker Settings")
 
 if username:
-    df, existing_file = load_data(username)
+    drive = init_drive()
+    df, file_id, df_hash = get_data(username)
 
-    selected_date = st.sidebar.date_input("Select the date")
-    meat_events = st.sidebar.number_input("How many meat-eating events on this day?", min_value=0, step=1)
-
-    if st.sidebar.button("Save"):
-        selected_date = pd.to_datetime(selected_date).normalize()
-        df = df[df['date'] != selected_date]
-        new_row = pd.DataFrame({'date': [selected_date], 'count': [meat_events]})
-        df = pd.concat([df, new_row], ignore_index=True)
-        save_data(df, username, existing_file)
-        st.sidebar.success(f"Saved {meat_events} event(s) for {selected_date.date()}!")
-        st.rerun()
+    with st.sidebar:
+        log_day_fragment(df, username, file_id, df_hash)
 
     if not df.empty:
-        df['date'] = pd.to_datetime(df['date']).dt.normalize()
-        df_grouped = df.groupby('date')['count'].sum()
-
-        start_date = pd.to_datetime('2025-02-10')
-        all_dates = pd.date_range(start=start_date, end=datetime.today(), freq='D')
-        df_grouped = df_grouped.reindex(all_dates)
-        df_grouped_filled = df_grouped.fillna(1)
-
         today = pd.Timestamp(datetime.today().date())
+        view = compute_view(df, df_hash, today)
+        active_achievements = view['active_achievements']
+        negative_message = view['negative_message']
 
         if 'archived_achievements' not in st.session_state:
             st.session_state.archived_achievements = []
 
-        longest_streak = current_streak = 0
-        for val in df_grouped.values:
-            if val == 0:
-                current_streak += 1
-                longest_streak = max(longest_streak, current_streak)
-            else:
-                current_streak = 0
-
         col1, col2 = st.columns(2)
-        col1.metric("🥗 Days without meat", f"{current_streak} days")
-        col2.metric("🏆 Longest streak", f"{longest_streak} days")
-
-# --- Define All Streak Achievements ---
-        streak_achievements = {
-            100: "100-day streak",
-            111: "111-day streak",
-            125: "125-day streak",
-            150: "150-day streak",
-            175: "175-day streak",
-            183: "183-day streak",
-            222: "222-day streak",
-            250: "250-day streak",
-        }
-
-        active_achievements = []
-        negative_message = None
-
-        # --- Meat-Free Calendar Weeks ---
-        df_zero_filled = df_grouped.fillna(999)
-        calendar_weeks = df_zero_filled.groupby([df_zero_filled.index.isocalendar().year, df_zero_filled.index.isocalendar().week])
-        meat_free_weeks = 0
-        for _, week in calendar_weeks:
-            if len(week) == 7 and all(week == 0):
-                meat_free_weeks += 1
-        
-        # --- Initialize Achievements ---
-        active_achievements = []
-        negative_message = None
-
-        # --- Meat-Free Calendar Weeks ---
-        df_zero_filled = df_grouped.fillna(999)
-        calendar_weeks = df_zero_filled.groupby([df_zero_filled.index.isocalendar().year, df_zero_filled.index.isocalendar().week])
-        meat_free_weeks = 0
-        for _, week in calendar_weeks:
-            if len(week) == 7 and all(week == 0):
-                meat_free_weeks += 1
-
-        # --- Handle Meat-Free Week Achievement (single dynamic) ---
-        if meat_free_weeks > 0:
-            week_achievement_name = f"{meat_free_weeks}-week meat-free streak"
-            active_achievements.append(week_achievement_name)
-
-        # --- Add only the highest unlocked streak achievement ---
-        unlocked_streaks = [day for day in streak_achievements if longest_streak >= day]
-        if unlocked_streaks:
-            highest = max(unlocked_streaks)
-            active_achievements.append(streak_achievements[highest])
-
-        # --- Handle Negative Achievement ---
-        if df_grouped[df_grouped > 0].index.max() == today:
-            active_achievements.clear()
-            negative_message = """
-                <div style='background-color:#f8d7da;padding:20px;border-radius:10px;border-left:5px solid red;'>
-                    <strong>🚨 Oh no! You ate meat after reaching such a nice streak! 👎</strong><br>
-                    <strong>💚 Don't worry though, it's just a small setback.</strong><br>
-                    <strong>🐄 Get right back to saving animals and unlock your achievements again!</strong>
-                </div>
-            """
+        col1.metric("🥗 Days without meat", f"{view['current_streak']} days")
+        col2.metric("🏆 Longest streak", f"{view['longest_streak']} days")
 
         # --- Display Active Achievements ---
         if active_achievements:
             st.markdown("### Active Achievement")
             for achievement in active_achievements:
-                if achievement == "100-day streak":
-                    st.markdown("""
-                        <div style='background-color:#d0ebff;padding:20px;border-radius:10px;border-left:5px solid #339af0;'>
-                            <strong>🌈 100 meat-free days! You're on another level. 🐄🐖🐓🐑🐟 Thank you from the animals.</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "111-day streak":
-                    st.markdown("""
-                        <div style='background-color:#d3f9d8;padding:20px;border-radius:10px;border-left:5px solid #69db7c;'>
-                            <strong>🌀 111 days! A magical repeating streak. The universe approves! ✨</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "125-day streak":
-                    st.markdown("""
-                        <div style='background-color:#fff3bf;padding:20px;border-radius:10px;border-left:5px solid #ffd43b;'>
-                            <strong>💫 125 days! Your journey is inspiring. Every animal is cheering you on!/strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "150-day streak":
-                    st.markdown("""
-                        <div style='background-color:#ffe0b2;padding:20px;border-radius:10px;border-left:5px solid #ffa94d;'>
-                            <strong>🔥 150 days! That’s dedication. The planet and animals thank you. 🌍🐷</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "175-day streak":
-                    st.markdown("""
-                        <div style='background-color:#ffc9c9;padding:20px;border-radius:10px;border-left:5px solid #ff6b6b;'>
-                            <strong>🌻 175 days meat-free! Your compassion is amazing 🌿</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "183-day streak":
-                    st.markdown("""
-                        <div style='background-color:#e5dbff;padding:20px;border-radius:10px;border-left:5px solid #9775fa;'>
-                            <strong>💚183 Täg - es haubs Jahr! Wi cool isch ds!! </strong><br>
-                            <strong>💚I fröie mi so fescht bisch am dürezieh u i bi mega stouz uf di!💚</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-                elif achievement == "222-day streak":
+                if achievement == "222-day streak":
                     st.balloons()
-                    st.markdown("""
-                        <div style='background-color:#f3d9fa;padding:20px;border-radius:10px;border-left:5px solid #da77f2;'>
-                            <strong>🎯 222 Täg! Ds mues natürlech o spezieu füreghobe wärde😌 🐄🐖🐓</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
+                if achievement in ACHIEVEMENT_HTML:
+                    st.markdown(ACHIEVEMENT_HTML[achievement], unsafe_allow_html=True)
                 elif "week meat-free streak" in achievement:
                     week_count = achievement.split('-')[0]
-                    st.markdown(f"""
-                        <div style='background-color:#d4edda;padding:20px;border-radius:10px;border-left:5px solid green;'>
-                            <strong>🌿 {week_count} full calendar weeks meat-free! Outstanding!</strong><br>
-                            <strong>💚 Keep saving lives every week. 🐄🐖🐓🐟</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(WEEK_ACHIEVEMENT_HTML.format(week_count=week_count), unsafe_allow_html=True)
 
         # --- Display Negative Message ---
         if negative_message:
             st.markdown(negative_message, unsafe_allow_html=True)
 
         # Identify Unlogged Days
-        unlogged_days = df_grouped[df_grouped.isna()].index
-        unlogged_df = pd.DataFrame(unlogged_days, columns=["Unlogged Dates"])
-        unlogged_df["Unlogged Dates"] = unlogged_df["Unlogged Dates"].dt.strftime("%Y-%m-%d")
+        unlogged_days = view['unlogged_days']
 
         st.sidebar.markdown("---")
         st.sidebar.subheader("Bulk add No-Meat Days")
-        bulk_dates = st.sidebar.multiselect(
-            "Select multiple unlogged dates to mark as meat-free (0 events):",
-            options=unlogged_days,
-            format_func=lambda d: d.strftime("%Y-%m-%d")
-        )
-
-        if st.sidebar.button("Save selected days as 0"):
-            for date in bulk_dates:
-                date = pd.to_datetime(date).normalize()
-                df = df[df['date'] != date]
-                new_row = pd.DataFrame({'date': [date], 'count': [0]})
-                df = pd.concat([df, new_row], ignore_index=True)
-            save_data(df, username, existing_file)
+        with st.sidebar.form("bulk_add"):
+            bulk_dates = st.multiselect(
+                "Select multiple unlogged dates to mark as meat-free (0 events):",
+                options=unlogged_days,
+                format_func=lambda d: d.strftime("%Y-%m-%d")
+            )
+            bulk_save_clicked = st.form_submit_button("Save selected days as 0")
+
+        if bulk_save_clicked:
+            # All selected days are new rows (midnight timestamps from the daily index); add them in one concat
+            bulk_rows = pd.DataFrame({'count': 0}, index=pd.DatetimeIndex(bulk_dates, name='date'), dtype='int32')
+            df = pd.concat([df.drop(bulk_rows.index, errors='ignore'), bulk_rows])
+            save_data(df, username, file_id, df_hash)
             st.sidebar.success(f"Saved {len(bulk_dates)} zero-event day(s)!")
             st.rerun()
 
         # Plotting
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.bar(df_grouped_filled.index, df_grouped_filled.values, color='grey', alpha=0.6, label="Unlogged Day")
-        ax.bar(df_grouped.index[df_grouped > 0], df_grouped[df_grouped > 0], color='green', label="Logged Meat Eating")
-        ax.set_xlabel("Time")
-        ax.set_ylabel("Meat-Eating Events")
-
-        weekly_ticks = pd.date_range(start=df_grouped_filled.index[0], end=df_grouped_filled.index[-1], freq='W-MON')
-        ax.set_xticks(weekly_ticks)
-        ax.set_xticklabels(weekly_ticks.strftime('%Y-%m-%d'), rotation=45, ha='right')
-        ax.tick_params(axis='x', which='major', length=7, width=2, color='black')
-        ax.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
-        ax.legend()
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.bar_chart(view['chart_data'], x_label="Time", y_label="Meat-Eating Events", color=["#b3b3b3", "#008000"])
 
         # Download
-        df_download = df_grouped.reset_index()
-        df_download.columns = ['date', 'count']
-        df_download['date'] = df_download['date'].dt.strftime('%Y-%d-%m')
         st.download_button(
             label="📥 Download your data as CSV",
-            data=df_download.to_csv(index=False).encode('utf-8'),
+            data=lambda: build_download_csv(view['all_dates'], view['daily_counts']),
             file_name=f"{username}_meat_tracker_log.csv",
             mime='text/csv'
         )